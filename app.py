@@ -1,16 +1,14 @@
 import streamlit as st
-import joblib
 import pandas as pd
 import numpy as np
-import xgboost as xgb
 import json
-from sklearn.preprocessing import MultiLabelBinarizer
-from scipy.sparse import hstack
+import hashlib
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from retrieval.retrieval_program import RetrievalProgram
-from retrieval.retrieval_mentor import RetrievalMentor
-from retrieval.retrieval_core import RetrievalCore
+from models.registry import registry, PROGRAM_MODEL, CORE_MODEL, MENTOR_MODEL, KNN_PROGRAM_MODEL, RF_PROGRAM_MODEL
+from pipeline import ArtifactBuffer, ArtifactWriter, RecommendationPipeline
 
 ROOT = Path(__file__).resolve().parent
 
@@ -101,6 +99,13 @@ with st.sidebar:
     migration = (migration == "Yes")
     interests = st.multiselect("Interests (choose one or more)", options=INTEREST_OPTIONS, default=[], help="You can pick multiple interests")
     interests = ";".join([t.strip().lower() for t in interests])
+
+    # Alternative scorers are offered once their bundles have been trained
+    scorers = {"XGBoost": PROGRAM_MODEL}
+    for label, name in [("KNN (approximate)", KNN_PROGRAM_MODEL), ("Random forest", RF_PROGRAM_MODEL)]:
+        if (registry.root / name).exists():
+            scorers[label] = name
+    program_model = scorers[st.selectbox("Program scorer", list(scorers), index=0)]
     
     if tuition_fee == "less 20000":
         cost = 20000
@@ -135,53 +140,39 @@ with st.sidebar:
 
 json_path = st.session_state.get("json_path",str(ROOT / "output" / "student.json"))
 
-def program_labelmatch(df):
-    bundle = joblib.load(ROOT / "models" / "xgb_program_labelmatch_regressor.pkl")
-    if isinstance(bundle, dict) and "model" in bundle:
-        model   = bundle["model"]
-        mlb_int = bundle["mlb_int"]
-        mlb_tag = bundle["mlb_tag"]
-
-    df["interests"]  = df["interests"].fillna("")
-    df["field_tags"] = df["field_tags"].fillna("")
-
-    def to_list(s):
-        return [x.strip().lower() for x in str(s).split(";") if x.strip()]
-
-    X_int = mlb_int.transform(df["interests"].map(to_list))
-    X_tag = mlb_tag.transform(df["field_tags"].map(to_list))
-    X = hstack([X_int, X_tag], format="csr")
-
-    dX = xgb.DMatrix(X)
-    pred = model.predict(dX)
-
-    out = df.copy()
-    out["pred_label_match"] = np.round(pred, 4)
-    return out
-
-def core_labelmatch(df):
-    bundle = joblib.load(ROOT / "models" / "xgb_core_program_labelmatch_regressor.pkl")
-    if isinstance(bundle, dict) and "model" in bundle:
-        model   = bundle["model"]
-        mlb_int = bundle["mlb_int"]
-        mlb_tag = bundle["mlb_tag"]
-
-    df["interests"] = df["interests"].fillna("")
-    df["core_program"] = df["core_program"].fillna("")
-
-    def to_list(s):
-        return [x.strip().lower() for x in str(s).split(";") if x.strip()]
-
-    X_int = mlb_int.transform(df["interests"].map(to_list))
-    X_tag = mlb_tag.transform(df["core_program"].map(to_list))
-    X = hstack([X_int, X_tag], format="csr")
-
-    dX = xgb.DMatrix(X)
-    pred = model.predict(dX)
-
-    out = df.copy()
-    out["pred_label_match"] = np.round(pred, 4)
-    return out
+# Bundles are loaded and warmed once per process and shared by all sessions
+registry.preload([PROGRAM_MODEL, CORE_MODEL, MENTOR_MODEL, program_model])
+
+# Output CSVs are written in the background and never read back by a later stage
+@st.cache_resource
+def artifact_writer():
+    return ArtifactWriter(ROOT / "output")
+
+# Mentors of freshly ranked programs are scored ahead of the click that asks for them
+@st.cache_resource
+def mentor_prefetcher():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="mentor-prefetch")
+
+def prefetch_mentors(ranked: pd.DataFrame):
+    # Artifacts are held back until the mentors are actually shown
+    buffer = ArtifactBuffer()
+    return RecommendationPipeline(artifacts=buffer).mentors(ranked, top_n=3, per_program=3), buffer
+
+def inputs_key() -> str:
+    # Everything the ranked programs depend on: sidebar inputs, the saved student and the scorer
+    path = Path(json_path)
+    saved = path.read_text(encoding="utf-8") if path.exists() else ""
+    blob = json.dumps({"payload": payload, "student": saved, "program_model": program_model}, sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+# Ranked programs and their prefetched mentors are dropped once the inputs change
+current_key = inputs_key()
+if st.session_state.get("programs_key") not in (None, current_key):
+    prefetch = st.session_state.pop("mentor_prefetch", None)
+    if prefetch is not None:
+        prefetch[1].cancel()
+    st.session_state.pop("ranked_programs", None)
+    st.session_state["programs_key"] = None
 
 col1, col2 = st.columns(2)
 if "last_output" not in st.session_state:
@@ -192,29 +183,14 @@ if "last_action" not in st.session_state:
 # Programs recommendation
 with col1:
     if st.button("Find eligible programs", use_container_width=True):
-        if migration != True:
-            r = RetrievalProgram()
-            df = r.run(json_path)
+        student = RetrievalProgram.load_student_json(Path(json_path))
+        pipe = RecommendationPipeline(artifacts=artifact_writer(), program_model=program_model)
 
-            out = program_labelmatch(df)
-            out = out.sort_values("pred_label_match", ascending=False).reset_index(drop=True)
-            out.to_csv( ROOT / "output" / "student_program.csv", index=False)
-
-            out = out.head(3).reset_index(drop=True)
-        else:
-            f = RetrievalCore()
-            df = f.find(json_path)
-
-            ep = core_labelmatch(df)
-            ep = ep.sort_values("pred_label_match", ascending=False).reset_index(drop=True)
-            ep.to_csv( ROOT / "output" / "core_program.csv", index=False)
-        
-            dp = f.run(json_path, top_n=3)
-            out = program_labelmatch(dp)
-            out = out.sort_values("pred_label_match", ascending=False).reset_index(drop=True)
-            
-            out.to_csv( ROOT / "output" / "student_program.csv", index=False)
-            out = out.head(3).reset_index(drop=True)
+        ranked = pipe.programs(student, migration=migration, top_n=3)
+        st.session_state["ranked_programs"] = ranked
+        st.session_state["programs_key"] = current_key
+        st.session_state["mentor_prefetch"] = (current_key, mentor_prefetcher().submit(prefetch_mentors, ranked))
+        out = ranked.head(3).reset_index(drop=True)
 
         st.session_state["last_output"] = out
         st.session_state["last_action"] = "programs"
@@ -222,36 +198,22 @@ with col1:
 # Mentors recommendation
 with col2:
     if st.button("Find mentors for programs", use_container_width=True):
-        rm = RetrievalMentor()
-        df = rm.run(top_n=3)
-
-        bundle = joblib.load(ROOT / "models" / "xgb_mentor_labelmatch_regressor.pkl")
-        model = bundle["model"]
-        mlb_int = bundle["mlb_int"]
-        mlb_tag = bundle["mlb_tag"]
-
-        df["field_tags"] = df["field_tags"].fillna("")
-        df["expertise_tags"] = df["expertise_tags"].fillna("")
-
-        def to_list(s):
-            return [x.strip().lower() for x in str(s).split(";") if x.strip()]
-
-        X_f = mlb_int.transform(df["field_tags"].map(to_list))
-        X_e = mlb_tag.transform(df["expertise_tags"].map(to_list))
-        X = hstack([X_f, X_e], format="csr")
-
-        dX = xgb.DMatrix(X)
-        pred = model.predict(dX)
-
-        scored = df.copy()
-        scored["pred_label_match"] = np.round(pred, 4)
-
-        scored = scored.sort_values(["program_id", "pred_label_match"], ascending=[True, False])
-        scored.to_csv(ROOT / "output" / "program_mentor.csv", index=False)
+        prefetch = st.session_state.get("mentor_prefetch")
+        ranked = st.session_state.get("ranked_programs")
+        scored = None
+        if prefetch is not None and prefetch[0] == current_key and not prefetch[1].cancelled():
+            # Started when the programs were ranked; waits only if it is still running
+            scored, buffer = prefetch[1].result()
+            buffer.replay(artifact_writer())
+        elif ranked is not None:
+            # Programs ranked earlier in this session are handed over in memory
+            scored = RecommendationPipeline(artifacts=artifact_writer()).mentors(ranked, top_n=3, per_program=3)
+        else:
+            st.info("Find eligible programs first")
 
-        out = scored.groupby("program_id", as_index=False).head(3).reset_index(drop=True)
-        st.session_state["last_output"] = out
-        st.session_state["last_action"] = "mentors"
+        if scored is not None:
+            st.session_state["last_output"] = scored.reset_index(drop=True)
+            st.session_state["last_action"] = "mentors"
 
 def render_program_cards(df: pd.DataFrame, top_k: int = 3):
     small = df.head(top_k).reset_index(drop=True)
@@ -352,8 +314,9 @@ def render_mentor_cards(df: pd.DataFrame, top_k_prog: int = 3, top_k_mentor: int
 if st.session_state["last_output"] is not None:
     df_out = st.session_state["last_output"]
 
+    # Re-orders the cached result only; stable, so equal ranks keep their score order
     if sort_rank and "overall_ranking" in df_out.columns:
-        df_out = df_out.sort_values("overall_ranking", ascending=True).reset_index(drop=True)
+        df_out = df_out.sort_values("overall_ranking", ascending=True, kind="stable").reset_index(drop=True)
 
     if st.session_state.get("last_action") == "programs":
         render_program_cards(df_out, top_k=3)
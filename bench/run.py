@@ -0,0 +1,298 @@
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench.scale import scaled_catalog, students
+from features.label_match import LabelMatcher
+from features.shards import iter_cross_blocks, write_csv
+from models.registry import registry, PROGRAM_MODEL, CORE_MODEL, MENTOR_MODEL
+from retrieval.retrieval_core import RetrievalCore
+from retrieval.retrieval_mentor import RetrievalMentor
+from retrieval.retrieval_program import RetrievalProgram
+
+RESULTS = ROOT / "bench" / "results"
+
+# name -> (setup(ctx) returning (fn, items), model artifacts it needs)
+BENCHMARKS = {}
+
+
+def benchmark(name, models=()):
+    def register(setup):
+        BENCHMARKS[name] = (setup, tuple(models))
+        return setup
+    return register
+
+
+class Context:
+    """Inputs shared by the benchmarks of one scale.
+
+    Every output a benchmark writes goes to a temporary directory, never
+    to output/ or features/.
+    """
+
+    def __init__(self, scale: int, n_students: int, feature_rows: int, tmp: Path):
+        self.scale = scale
+        self.catalog = scaled_catalog(scale)
+        self.students = students(n_students)
+        self.feature_rows = feature_rows
+        self.tmp = tmp
+
+    def student_files(self) -> list:
+        paths = []
+        for i, s in enumerate(self.students):
+            path = self.tmp / f"student_{i}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(s, f)
+            paths.append(path)
+        return paths
+
+    def retriever(self, cls):
+        r = cls(self.catalog)
+        r.OUT = self.tmp
+        return r
+
+
+# retrieval
+
+@benchmark("retrieval_program.run")
+def _(ctx):
+    r = ctx.retriever(RetrievalProgram)
+    paths = ctx.student_files()
+    return (lambda: [r.run(p) for p in paths]), len(paths)
+
+
+@benchmark("retrieval_core.run")
+def _(ctx):
+    r = ctx.retriever(RetrievalCore)
+    paths = ctx.student_files()
+    # Unscored core labels in taxonomy order stand in for the ranked ones
+    cores = [r.core_programs(s) for s in ctx.students]
+    return (lambda: [r.run(p, core=c) for p, c in zip(paths, cores)]), len(paths)
+
+
+@benchmark("retrieval_mentor.run")
+def _(ctx):
+    r = ctx.retriever(RetrievalMentor)
+    programs = ctx.retriever(RetrievalProgram)
+    sps = [programs.eligible_programs(s) for s in ctx.students]
+    return (lambda: [r.run(top_n=3, sp=sp) for sp in sps]), len(sps)
+
+
+# feature generation, the block-wise cross join of the full_dataset_* scripts
+
+def _cross(ctx, name, left, left_col, right, right_col, sim, columns, block_size):
+    matcher = LabelMatcher(sim)
+    out = ctx.tmp / f"eligible_{name}.csv"
+
+    def fn():
+        blocks = iter_cross_blocks(left, left_col, right, right_col, matcher, score_col=columns[-1],
+                                   block_size=block_size, columns=columns)
+        write_csv(blocks, out)
+
+    return fn, len(left) * len(right)
+
+
+@benchmark("full_dataset_program")
+def _(ctx):
+    left = pd.DataFrame(ctx.students)[["student_id", "interests"]].head(ctx.feature_rows)
+    right = ctx.catalog.programs[["program_id", "field_tags"]]
+    return _cross(ctx, "program", left, "interests", right, "field_tags", ctx.catalog.sim_program,
+                  ["student_id", "interests", "program_id", "field_tags", "label_match"], 256)
+
+
+@benchmark("full_dataset_core")
+def _(ctx):
+    # The core label set is fixed, so the student side grows with the scale instead
+    left = pd.DataFrame(students(ctx.feature_rows * ctx.scale))[["student_id", "interests"]]
+    right = pd.DataFrame({"core_program": list(ctx.catalog.sim_core.columns)})
+    return _cross(ctx, "core", left, "interests", right, "core_program", ctx.catalog.sim_core,
+                  ["student_id", "interests", "core_program", "program_match"], 1024)
+
+
+@benchmark("full_dataset_mentor")
+def _(ctx):
+    left = ctx.catalog.programs[["program_id", "field_tags"]].head(ctx.feature_rows)
+    right = ctx.catalog.mentors[["mentor_id", "expertise_tags"]]
+    return _cross(ctx, "mentor", left, "field_tags", right, "expertise_tags", ctx.catalog.sim_mentor,
+                  ["program_id", "field_tags", "mentor_id", "expertise_tags", "label_match"], 256)
+
+
+# model scoring, with the prediction cache emptied so every call reaches the booster
+
+def _labelmatch(ctx, score, model_name, df):
+    from models.labelmatch import prediction_cache
+
+    def fn():
+        prediction_cache(model_name).clear()
+        score(df, ctx.catalog)
+
+    return fn, len(df)
+
+
+@benchmark("program_labelmatch", models=[PROGRAM_MODEL])
+def _(ctx):
+    from models.labelmatch import program_labelmatch
+    r = RetrievalProgram(ctx.catalog)
+    df = pd.concat([r.eligible_programs(s) for s in ctx.students], ignore_index=True)
+    return _labelmatch(ctx, program_labelmatch, PROGRAM_MODEL, df)
+
+
+@benchmark("core_labelmatch", models=[CORE_MODEL])
+def _(ctx):
+    from models.labelmatch import core_labelmatch
+    r = RetrievalCore(ctx.catalog)
+    df = pd.concat([r.core_programs(s) for s in ctx.students], ignore_index=True)
+    return _labelmatch(ctx, core_labelmatch, CORE_MODEL, df)
+
+
+@benchmark("mentor_labelmatch", models=[MENTOR_MODEL])
+def _(ctx):
+    from models.labelmatch import mentor_labelmatch
+    programs = RetrievalProgram(ctx.catalog)
+    mentors = RetrievalMentor(ctx.catalog)
+    df = pd.concat([mentors.eligible_mentors(3, programs.eligible_programs(s)) for s in ctx.students], ignore_index=True)
+    return _labelmatch(ctx, mentor_labelmatch, MENTOR_MODEL, df)
+
+
+# the app's "find programs -> find mentors" flow
+
+@benchmark("end_to_end", models=[PROGRAM_MODEL, MENTOR_MODEL])
+def _(ctx):
+    from pipeline import RecommendationPipeline
+    pipe = RecommendationPipeline(ctx.catalog)
+    return (lambda: [pipe.run(s, top_n=3, per_program=3) for s in ctx.students]), len(ctx.students)
+
+
+def measure(fn, repeat: int) -> dict:
+    """Median/min wall time over `repeat` calls after one warm-up, then peak memory of one traced call."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    # Traced separately: tracemalloc slows allocation-heavy code down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"median_s": statistics.median(times), "min_s": min(times), "peak_mb": peak / 2 ** 20}
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def run(names, scales, repeat: int, n_students: int, feature_rows: int) -> dict:
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = Context(scale, n_students, feature_rows, Path(tmp))
+            for name in names:
+                setup, models = BENCHMARKS[name]
+                missing = [m for m in models if not (registry.root / m).exists()]
+                if missing:
+                    print(f"{name} x{scale}: skipped, {', '.join(missing)} not trained")
+                    continue
+
+                fn, items = setup(ctx)
+                res = measure(fn, repeat)
+                res.update({"name": name, "scale": scale, "items": items, "repeat": repeat,
+                            "items_per_s": items / res["median_s"] if res["median_s"] > 0 else None})
+                results.append(res)
+                print(f"{name} x{scale}: {res['median_s'] * 1e3:.1f} ms median, "
+                      f"{items} items, {res['peak_mb']:.1f} MB peak")
+    return {"meta": metadata(), "results": results}
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """Rows of (name, scale, time ratio, peak ratio, regressed) for benchmarks present in both runs."""
+    old = {(r["name"], r["scale"]): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        b = old.get((r["name"], r["scale"]))
+        if b is None:
+            continue
+        t = r["median_s"] / b["median_s"] if b["median_s"] > 0 else float("inf")
+        m = r["peak_mb"] / b["peak_mb"] if b["peak_mb"] > 0 else float("inf")
+        rows.append((r["name"], r["scale"], t, m, t > 1 + threshold or m > 1 + threshold))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Latency, throughput and peak memory benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("run", help="run benchmarks and save a JSON result file")
+    p.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    p.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="catalog replication factors")
+    p.add_argument("--repeat", type=int, default=5, help="timed calls per benchmark")
+    p.add_argument("--students", type=int, default=20, help="students per retrieval, scoring and end-to-end call")
+    p.add_argument("--feature-rows", type=int, default=100, help="left-side rows of the feature cross joins")
+    p.add_argument("--out", type=Path, default=None, help="result file (default: bench/results/<commit>.json)")
+
+    c = sub.add_parser("compare", help="compare two result files")
+    c.add_argument("base", type=Path)
+    c.add_argument("new", type=Path)
+    c.add_argument("--threshold", type=float, default=0.10, help="relative slowdown or memory growth counted as a regression")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "run":
+        unknown = set(args.names) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        report = run(args.names or list(BENCHMARKS), args.scales, args.repeat, args.students, args.feature_rows)
+        out = args.out or RESULTS / f"{report['meta']['commit'] or 'local'}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print("results written to", out)
+        return 0
+
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    rows = compare(base, new, args.threshold)
+    print(f"{'benchmark':<24}{'scale':>6}{'time':>10}{'memory':>10}")
+    for name, scale, t, m, bad in rows:
+        print(f"{name:<24}{scale:>6}{t:>9.2f}x{m:>9.2f}x{'  REGRESSION' if bad else ''}")
+    return 1 if any(r[4] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import pandas as pd
+from pathlib import Path
+
+from etl.data_clean import read_clean
+from retrieval.catalog import Catalog, get_catalog
+
+ROOT = Path(__file__).resolve().parents[1]
+RAW1 = ROOT / "data_clean"
+
+STUDENT_COLUMNS = ["student_id", "major_intent", "degree_goal", "english_test_type", "english_score_overall",
+                   "gpa_std_4", "budget_aud_per_year", "interests"]
+
+
+def _offset(ids: pd.Series) -> int:
+    # A power of ten above every id, so replica k maps id -> id + k * offset
+    return 10 ** len(str(int(ids.max())))
+
+
+def _replicate(df: pd.DataFrame, scale: int, offsets: dict) -> pd.DataFrame:
+    parts = []
+    for k in range(scale):
+        part = df.copy()
+        for col, off in offsets.items():
+            part[col] = part[col] + k * off
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def scaled_catalog(scale: int, base: Catalog | None = None) -> Catalog:
+    """The catalog with every institution, program and mentor repeated `scale` times.
+
+    Replicas get fresh integer ids, so eligible programs and mentors per
+    student grow linearly with `scale` while the label vocabulary and the
+    requirement distributions stay those of the shipped data.
+    """
+    base = base if base is not None else get_catalog()
+    if scale == 1:
+        return base
+
+    prog = {"program_id": _offset(base.programs["program_id"]), "institution_id": _offset(base.institutions["institution_id"])}
+    inst = {"institution_id": prog["institution_id"]}
+    tables = {
+        "programs": _replicate(base.programs, scale, prog),
+        "institutions": _replicate(base.institutions, scale, inst),
+        "reqs": _replicate(base.reqs, scale, {"program_id": prog["program_id"]}),
+        "scholarship": _replicate(base.scholarship, scale, inst),
+        "mentors": _replicate(base.mentors, scale, {"mentor_id": _offset(base.mentors["mentor_id"])}),
+        "sim_core": base.sim_core,
+        "sim_program": base.sim_program,
+        "sim_mentor": base.sim_mentor,
+    }
+    return Catalog(tables, {"bench_scale": [scale, 0]})
+
+
+def students(n: int, seed: int = 0) -> list:
+    """`n` student dicts drawn from data_clean/students.csv, as the app passes them."""
+    df = read_clean(RAW1 / "students.csv")
+    df = df.sample(n=n, replace=n > len(df), random_state=seed)
+    out = []
+    for row in df[STUDENT_COLUMNS].to_dict("records"):
+        row["student_id"] = str(row["student_id"])
+        row["interests"] = "" if pd.isna(row["interests"]) else str(row["interests"])
+        out.append(row)
+    return out
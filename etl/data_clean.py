@@ -1,76 +1,184 @@
+import json
+import hashlib
+import argparse
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 RAW = ROOT / "data_raw"
 OUT = ROOT / "data_clean"
-OUT.mkdir(parents=True, exist_ok=True)
 
-# institutions
-institutions = pd.read_csv(RAW / "institutions.csv")
-
-institutions["institution_id"] = institutions["institution_id"].astype(str)
-institutions["overall_ranking"] = pd.to_numeric(institutions["overall_ranking"], errors="coerce")
-institutions["locations"] = institutions["locations"].str.title()
-institutions["tuition_fee_low"] = institutions["tuition_fee_low"].astype(float)
-institutions["tuition_fee_up"] = institutions["tuition_fee_up"].astype(float)
-
-institutions = institutions.reset_index(drop=True)
-institutions.to_csv(OUT / "institutions.csv", index=False)
-
-# programs
-programs = pd.read_csv(RAW / "programs.csv")
-
-programs["program_id"] = programs["program_id"].astype(str)
-programs["institution_id"] = programs["institution_id"].astype(str)
-programs["degree_level"] = programs["degree_level"].astype(str)
-programs["is_migration_aligned"] = programs["is_migration_aligned"].astype(bool)
-
-programs = programs.reset_index(drop=True)
-programs.to_csv(OUT / "programs.csv", index=False)
-
-# program_requirements
-reqs = pd.read_csv(RAW / "program_requirements.csv")
-
-reqs["program_id"] = reqs["program_id"].astype(str)
-reqs["min_gpa_std_4"] = reqs["min_gpa_std_4"].astype(float).clip(0, 4)
-reqs["english_required_type"] = reqs["english_required_type"].astype(str).str.strip()
-reqs["english_min_overall"] = reqs["english_min_overall"].astype(float)
-
-reqs = reqs.reset_index(drop=True)
-reqs.to_csv(OUT / "program_requirements.csv", index=False)
-
-# students
-students = pd.read_csv(RAW / "students.csv")
-
-students["student_id"] = students["student_id"].astype(str)
-students["age"] = students["age"].astype(int).clip(16, 40)
-students["budget_aud_per_year"] = students["budget_aud_per_year"].astype(float)
-students["migration_interest"] = students["migration_interest"].astype(bool)
-students["gpa_std_4"] = (students["gpa_std_4"]).astype(float).clip(0, 4)
-students["english_test_type"] = students["english_test_type"].astype(str).str.strip()
-students["english_score_overall"] = students["english_score_overall"].astype(float)
-
-students = students.reset_index(drop=True)
-students.to_csv(OUT / "students.csv", index=False)
-
-# mentors
-mentors = pd.read_csv(RAW / "mentors.csv")
-
-mentors["mentor_id"] = mentors["mentor_id"].astype(str)
-mentors["years_experience"] = mentors["years_experience"].astype(int).clip(0, 50)
-
-mentors = mentors.reset_index(drop=True)
-mentors.to_csv(OUT / "mentors.csv", index=False)
-
-# scholarship
-scholarship = pd.read_csv(RAW / "scholarship.csv")
-
-scholarship["institution_id"] = scholarship["institution_id"].astype(str)
-scholarship["scholarship_percent"] = scholarship["scholarship_percent"].astype(float).clip(0, 1)
-scholarship["scholarship_GPA_request"] = scholarship["scholarship_GPA_request"].astype(float).clip(0, 4)
-
-scholarship = scholarship.reset_index(drop=True)
-scholarship.to_csv(OUT / "scholarship.csv", index=False)
-
-print("cleaned parquet written to", OUT.resolve())
\ No newline at end of file
+# Declarative cleaning rules per table.
+# cast: str | numeric | int | float | bool, applied first, then strip, title and clip.
+# parquet: dtype of the column in the typed Parquet output. Ids stay strings, since they
+# need not be numeric; money, scores and GPAs stay float64 so no value changes.
+SCHEMAS = {
+    "institutions": {
+        "institution_id": {"cast": "str", "parquet": "str"},
+        "type": {"parquet": "category"},
+        "country": {"parquet": "category"},
+        "overall_ranking": {"cast": "numeric", "parquet": "Int32"},
+        "locations": {"title": True, "parquet": "category"},
+        "visa_support": {"parquet": "category"},
+        "teaching_languages": {"parquet": "category"},
+        "tuition_fee_low": {"cast": "float", "parquet": "float64"},
+        "tuition_fee_up": {"cast": "float", "parquet": "float64"},
+    },
+    "programs": {
+        "program_id": {"cast": "str", "parquet": "str"},
+        "institution_id": {"cast": "str", "parquet": "str"},
+        "program_name": {"parquet": "category"},
+        "degree_level": {"cast": "str", "parquet": "category"},
+        "mode": {"parquet": "category"},
+        "is_migration_aligned": {"cast": "bool"},
+    },
+    "program_requirements": {
+        "program_id": {"cast": "str", "parquet": "str"},
+        "min_gpa_std_4": {"cast": "float", "clip": (0, 4), "parquet": "float64"},
+        "english_required_type": {"cast": "str", "strip": True, "parquet": "category"},
+        "english_min_overall": {"cast": "float", "parquet": "float64"},
+    },
+    "students": {
+        "student_id": {"cast": "str", "parquet": "str"},
+        "age": {"cast": "int", "clip": (16, 40), "parquet": "int32"},
+        "country_origin": {"parquet": "category"},
+        "gender": {"parquet": "category"},
+        "major_intent": {"parquet": "category"},
+        "degree_goal": {"parquet": "category"},
+        "study_purpose": {"parquet": "category"},
+        "preferred_countries": {"parquet": "category"},
+        "preferred_states": {"parquet": "category"},
+        "budget_aud_per_year": {"cast": "float", "parquet": "float64"},
+        "migration_interest": {"cast": "bool"},
+        "english_test_type": {"cast": "str", "strip": True, "parquet": "category"},
+        "english_score_overall": {"cast": "float", "parquet": "float64"},
+        "primary_language": {"parquet": "category"},
+        "gpa_std_4": {"cast": "float", "clip": (0, 4), "parquet": "float64"},
+        "previous_degree": {"parquet": "category"},
+    },
+    "mentors": {
+        "mentor_id": {"cast": "str", "parquet": "str"},
+        "country_origin": {"parquet": "category"},
+        "education_background": {"parquet": "category"},
+        "years_experience": {"cast": "int", "clip": (0, 50), "parquet": "int32"},
+        "immigration_journey": {"parquet": "category"},
+        "mentor_location": {"parquet": "category"},
+        "contact_method": {"parquet": "category"},
+        "gender": {"parquet": "category"},
+    },
+    "scholarship": {
+        "institution_id": {"cast": "str", "parquet": "str"},
+        "scholarship_percent": {"cast": "float", "clip": (0, 1), "parquet": "float64"},
+        "scholarship_GPA_request": {"cast": "float", "clip": (0, 4), "parquet": "float64"},
+    },
+}
+
+
+def clean(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    df = df.copy()
+    for col, spec in schema.items():
+        s = df[col]
+        cast = spec.get("cast")
+        if cast == "numeric":
+            s = pd.to_numeric(s, errors="coerce")
+        elif cast is not None:
+            s = s.astype(cast)
+        if spec.get("strip"):
+            s = s.str.strip()
+        if spec.get("title"):
+            s = s.str.title()
+        if "clip" in spec:
+            s = s.clip(*spec["clip"])
+        df[col] = s
+    return df.reset_index(drop=True)
+
+
+def typed(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    # Compact dtypes for the Parquet copy; the CSV keeps the cleaned values as they are
+    return df.astype({col: spec["parquet"] for col, spec in schema.items() if "parquet" in spec})
+
+
+def clean_path(path: Path) -> Path:
+    # The typed Parquet copy of a cleaned CSV when it is at least as new, else the CSV
+    path = Path(path)
+    parquet = path.with_suffix(".parquet")
+    if parquet.exists() and (not path.exists() or parquet.stat().st_mtime_ns >= path.stat().st_mtime_ns):
+        return parquet
+    return path
+
+
+def read_clean(path) -> pd.DataFrame:
+    """A cleaned table, read from its typed Parquet copy when there is one.
+
+    Columns come back with the dtypes a CSV read gives: categories as
+    strings, string ids as int64 when every id is an integer, int32 as
+    int64. Floats are stored as float64 and read back unchanged.
+    """
+    path = clean_path(path)
+    if path.suffix != ".parquet":
+        return pd.read_csv(path)
+    df = pd.read_parquet(path)
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            df[col] = s.astype(s.cat.categories.dtype)
+        elif isinstance(s.dtype, pd.StringDtype):
+            # Ids like "S000123" stay strings, all-integer ids read as a CSV reader parses them
+            if s.notna().all() and s.str.fullmatch(r"[+-]?\d+").all():
+                df[col] = s.astype(np.int64)
+        elif s.dtype == np.int32:
+            df[col] = s.astype(np.int64)
+        elif s.dtype == pd.Int32Dtype():
+            # Nullable integers read like a CSV column: int64, or float64 with missing values
+            df[col] = s.astype(np.float64 if s.isna().any() else np.int64)
+    return df
+
+
+def fingerprint(path: Path, schema: dict) -> str:
+    # Raw file content plus the schema, so editing either re-cleans the table
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    h.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def main(force: bool = False, raw: Path = RAW, out: Path = OUT) -> None:
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / ".etl_manifest.json"
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    for name, schema in SCHEMAS.items():
+        src = raw / f"{name}.csv"
+        digest = fingerprint(src, schema)
+        outputs = [out / f"{name}.csv", out / f"{name}.parquet"]
+
+        if not force and manifest.get(name) == digest and all(p.exists() for p in outputs):
+            print(f"{name}: unchanged, skipped")
+            continue
+
+        df = clean(pd.read_csv(src), schema)
+        df.to_csv(outputs[0], index=False)
+        typed(df, schema).to_parquet(outputs[1], index=False)
+        manifest[name] = digest
+        print(f"{name}: {len(df)} rows cleaned")
+
+        # Record progress per table so an interrupted run resumes where it stopped
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    print("cleaned csv and parquet written to", out.resolve())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean data_raw tables into data_clean")
+    parser.add_argument("--force", action="store_true", help="re-clean every table even if its raw input is unchanged")
+    parser.add_argument("--raw", type=Path, default=RAW, help="directory of the raw tables, e.g. data_synth")
+    parser.add_argument("--out", type=Path, default=OUT, help="directory the cleaned tables are written to")
+    args = parser.parse_args()
+    main(force=args.force, raw=args.raw, out=args.out)
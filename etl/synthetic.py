@@ -0,0 +1,208 @@
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RAW = ROOT / "data_raw"
+OUT = ROOT / "data_synth"
+
+# How each column of a data_raw table is generated.
+# id:       sequential key 1..n
+# parent:   one row per row of that table, sharing its key
+# refs:     foreign key drawn uniformly from the generated ids of another table
+# joint:    column groups copied together from one random source row (keeps their correlation)
+# labels:   ';' lists, length and labels drawn from the source frequencies
+# anchored: column drawn from the row's own labels as often as in the source, else from its marginal
+# jitter:   numeric noise as a fraction of the column std, rounded and clipped to the source
+# person:   "First Last" from the source first and last name pools
+# template: formatted from the row id
+SPECS = {
+    "institutions": {
+        "id": "institution_id",
+        "joint": [["type", "country", "visa_support", "teaching_languages"], ["locations"],
+                  ["overall_ranking"], ["tuition_fee_low", "tuition_fee_up"]],
+        "template": {"institution_name": "Institution {id}", "website": "https://www.institution{id}.edu.au"},
+    },
+    "programs": {
+        "id": "program_id",
+        "refs": {"institution_id": "institutions"},
+        "joint": [["degree_level"], ["mode"], ["is_migration_aligned"]],
+        "labels": ["field_tags", "intakes"],
+        "anchored": {"program_name": "field_tags"},
+    },
+    "program_requirements": {
+        "parent": ("program_id", "programs"),
+        "joint": [["english_required_type", "english_min_overall"], ["min_gpa_std_4"]],
+        "jitter": {"min_gpa_std_4": 0.1},
+    },
+    "students": {
+        "id": "student_id",
+        "person": "name",
+        "joint": [["age"], ["country_origin"], ["gender"], ["major_intent"], ["degree_goal"], ["study_purpose"],
+                  ["preferred_countries"], ["budget_aud_per_year"], ["migration_interest"],
+                  ["english_test_type", "english_score_overall"], ["gpa_std_4"], ["previous_degree"]],
+        "labels": ["interests", "preferred_states", "languages"],
+        "anchored": {"primary_language": "languages"},
+        "jitter": {"budget_aud_per_year": 0.05, "gpa_std_4": 0.1},
+    },
+    "mentors": {
+        "id": "mentor_id",
+        "person": "mentor_name",
+        "joint": [["country_origin"], ["education_background"], ["years_experience"], ["immigration_journey"],
+                  ["mentor_location"], ["contact_method"], ["gender"]],
+        "labels": ["languages", "expertise_tags", "availability_slots"],
+    },
+    "scholarship": {
+        "parent": ("institution_id", "institutions"),
+        "joint": [["scholarship_percent", "scholarship_GPA_request"]],
+    },
+}
+
+# Parents before children, so row counts of parents are known
+ORDER = ["institutions", "programs", "program_requirements", "students", "mentors", "scholarship"]
+
+
+def split_labels(s: pd.Series) -> pd.Series:
+    return s.fillna("").astype(str).str.split(";").map(lambda xs: [x.strip() for x in xs if x.strip()])
+
+
+def decimals(s: pd.Series) -> int:
+    # Decimals the source values are written with (at most 6)
+    v = s.dropna().to_numpy(dtype=np.float64)
+    for d in range(7):
+        if np.allclose(np.round(v, d), v):
+            return d
+    return 6
+
+
+class TableModel:
+    """Empirical distributions of one source table, fitted once and sampled per chunk."""
+
+    def __init__(self, src: pd.DataFrame, spec: dict):
+        self.src = src
+        self.spec = spec
+        self.columns = list(src.columns)
+
+        self.labels = {}
+        for col in spec.get("labels", []):
+            lists = split_labels(src[col])
+            counts = lists.explode().value_counts()
+            lengths = lists.str.len().value_counts(normalize=True).sort_index()
+            self.labels[col] = (counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy(),
+                                lengths.index.to_numpy(), lengths.to_numpy())
+
+        self.anchored = {}
+        for col, from_col in spec.get("anchored", {}).items():
+            lists = split_labels(src[from_col])
+            hit = np.mean([v in labs for v, labs in zip(src[col], lists)])
+            marginal = src[col].value_counts(normalize=True)
+            self.anchored[col] = (from_col, hit, set(marginal.index), marginal.index.to_numpy(dtype=object), marginal.to_numpy())
+
+        self.jitter = {col: (frac * src[col].std(), decimals(src[col]), src[col].min(), src[col].max())
+                       for col, frac in spec.get("jitter", {}).items()}
+
+        if "person" in spec:
+            parts = src[spec["person"]].astype(str).str.split(" ", n=1)
+            self.first = parts.str[0].to_numpy(dtype=object)
+            self.last = parts.str[-1].to_numpy(dtype=object)
+
+    def _labels(self, col, n, rng):
+        vocab, p, lengths, lp = self.labels[col]
+        k = rng.choice(lengths, size=n, p=lp)
+        # Weighted sampling without replacement per row (Gumbel top-k)
+        keys = np.log(p)[None, :] + rng.gumbel(size=(n, len(vocab)))
+        order = np.argsort(-keys, axis=1)
+        return [";".join(vocab[order[i, :k[i]]]) for i in range(n)]
+
+    def sample(self, ids, rng, refs: dict) -> pd.DataFrame:
+        n = len(ids)
+        out = {}
+
+        key = self.spec.get("id") or self.spec["parent"][0]
+        out[key] = ids
+        for col, n_parent in refs.items():
+            out[col] = rng.integers(1, n_parent + 1, size=n)
+
+        for group in self.spec.get("joint", []):
+            rows = rng.integers(0, len(self.src), size=n)
+            for col in group:
+                out[col] = self.src[col].to_numpy()[rows]
+
+        for col, (scale, d, lo, hi) in self.jitter.items():
+            out[col] = np.clip(np.round(out[col] + rng.normal(0.0, scale, size=n), d), lo, hi)
+
+        for col in self.labels:
+            out[col] = self._labels(col, n, rng)
+
+        for col, (from_col, hit, allowed, values, p) in self.anchored.items():
+            fallback = rng.choice(values, size=n, p=p)
+            use = rng.random(n) < hit
+            picked = []
+            for i, cell in enumerate(out[from_col]):
+                options = [x for x in cell.split(";") if x in allowed] if use[i] else []
+                picked.append(options[rng.integers(len(options))] if options else fallback[i])
+            out[col] = picked
+
+        if "person" in self.spec:
+            first = self.first[rng.integers(0, len(self.first), size=n)]
+            last = self.last[rng.integers(0, len(self.last), size=n)]
+            out[self.spec["person"]] = [f"{a} {b}" for a, b in zip(first, last)]
+
+        for col, template in self.spec.get("template", {}).items():
+            out[col] = [template.format(id=i) for i in ids]
+
+        return pd.DataFrame(out)[self.columns]
+
+
+def generate(counts: dict, out_dir: Path = OUT, raw_dir: Path = RAW, seed: int = 0, chunk_size: int = 100_000) -> dict:
+    """Write synthetic versions of the six data_raw tables to `out_dir`.
+
+    `counts` gives rows for institutions, programs, students and mentors;
+    program_requirements and scholarship follow their parent tables. Chunk
+    c of table t is drawn from its own generator seeded with (seed, t, c),
+    so output depends only on the arguments and memory stays bounded by
+    `chunk_size`.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = dict(counts)
+
+    for t, name in enumerate(ORDER):
+        spec = SPECS[name]
+        model = TableModel(pd.read_csv(raw_dir / f"{name}.csv"), spec)
+        if "parent" in spec:
+            rows[name] = rows[spec["parent"][1]]
+        refs = {col: rows[table] for col, table in spec.get("refs", {}).items()}
+
+        path = out_dir / f"{name}.csv"
+        n = rows[name]
+        for c, start in enumerate(range(0, max(n, 1), chunk_size)):
+            rng = np.random.default_rng([seed, t, c])
+            ids = np.arange(start + 1, min(start + chunk_size, n) + 1)
+            df = model.sample(ids, rng, refs)
+            df.to_csv(path, mode="w" if c == 0 else "a", header=c == 0, index=False)
+        print(f"{name}: {n} rows")
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic data_raw tables of any size")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--programs", type=int, default=1330)
+    parser.add_argument("--mentors", type=int, default=800)
+    parser.add_argument("--institutions", type=int, default=None, help="default: keeps the source programs per institution")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows generated and written at a time")
+    parser.add_argument("--out", type=Path, default=OUT)
+    args = parser.parse_args()
+
+    institutions = args.institutions
+    if institutions is None:
+        ratio = len(pd.read_csv(RAW / "programs.csv")) / len(pd.read_csv(RAW / "institutions.csv"))
+        institutions = max(1, round(args.programs / ratio))
+
+    generate({"institutions": institutions, "programs": args.programs, "students": args.students,
+              "mentors": args.mentors}, args.out, seed=args.seed, chunk_size=args.chunk_size)
+    print("synthetic tables written to", Path(args.out).resolve())
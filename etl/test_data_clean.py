@@ -0,0 +1,34 @@
+import sys
+import pandas as pd
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from etl.data_clean import SCHEMAS, clean, read_clean, typed
+
+
+def write_table(tmp_path, df, schema):
+    df = clean(df, schema)
+    path = tmp_path / "table.csv"
+    df.to_csv(path, index=False)
+    typed(df, schema).to_parquet(path.with_suffix(".parquet"), index=False)
+    return path
+
+
+def test_read_clean_matches_csv(tmp_path):
+    for name, schema in SCHEMAS.items():
+        path = write_table(tmp_path, pd.read_csv(ROOT / "data_clean" / f"{name}.csv"), schema)
+        pd.testing.assert_frame_equal(read_clean(path), pd.read_csv(path))
+
+
+def test_read_clean_keeps_string_ids_and_exact_money(tmp_path):
+    schema = {"student_id": SCHEMAS["students"]["student_id"],
+              "budget_aud_per_year": SCHEMAS["students"]["budget_aud_per_year"]}
+    df = pd.DataFrame({"student_id": ["S000123", "S000124"], "budget_aud_per_year": [12345678.91, 35624.0]})
+    path = write_table(tmp_path, df, schema)
+    out = read_clean(path)
+    assert path.with_suffix(".parquet").exists()
+    assert out["student_id"].tolist() == ["S000123", "S000124"]
+    assert out["budget_aud_per_year"].tolist() == [12345678.91, 35624.0]
+    pd.testing.assert_frame_equal(out, pd.read_csv(path))